@@ -1,6 +1,7 @@
 \
 from __future__ import annotations
 
+import io
 import os
 import time
 from typing import List, Optional
@@ -212,10 +213,16 @@ with st.sidebar:
                                 help="Skip low-view videos (faster).")
     popular_first = st.toggle("Popular-first (faster insights)", value=True,
                               help="Sort by view count so your top performers appear first.")
+    top_k = st.number_input("Keep top N (0 = all)", min_value=0, max_value=2000, value=0, step=10,
+                            help="Only return (and fetch transcripts for) the first N videos after sorting.")
     include_transcripts = st.toggle("Include transcripts", value=True)
     lang = st.text_input("Transcript languages (comma)", value="en",
                          help="Example: en,es. We'll try these languages in order.")
     transcript_languages: Optional[List[str]] = [x.strip() for x in (lang or "").split(",") if x.strip()] or None
+    transcript_workers = st.number_input("Transcript workers", min_value=1, max_value=32, value=8, step=1,
+                                         help="How many transcripts to fetch in parallel. Lower this if you see TooManyRequests.")
+    force_refresh = st.toggle("Re-fetch cached transcripts", value=False,
+                              help="Transcripts are cached on disk for 7 days. Turn on to ignore the cache.")
 
     st.markdown("---")
     st.info(
@@ -262,6 +269,7 @@ if run:
 
     debug: List[str] = []
     status_box.info("Starting scrape…")
+    progress_bar = st.progress(0.0, text="Starting scrape…")
 
     t0 = time.time()
     cookie_path = None
@@ -287,8 +295,13 @@ if run:
             transcript_languages=transcript_languages,
             cookies_txt_path=cookie_path,
             debug=debug,
+            force_refresh=bool(force_refresh),
+            transcript_workers=int(transcript_workers),
+            top_k=int(top_k) or None,
+            progress_cb=lambda fraction, message: progress_bar.progress(min(fraction, 1.0), text=message),
         )
     except Exception as e:
+        progress_bar.empty()
         status_box.error(f"Scrape failed: {e}")
         with st.expander("Debug log"):
             st.code("\n".join(debug) if debug else "No debug info.")
@@ -300,6 +313,7 @@ if run:
             except Exception:
                 pass
 
+    progress_bar.empty()
     took = time.time() - t0
     status_box.success(f"Done in {took:.1f}s • {len(rows)} video(s) returned.")
 
@@ -334,7 +348,10 @@ if run:
     st.write("")
     st.dataframe(df, use_container_width=True, height=560)
 
-    csv_bytes = df.to_csv(index=False).encode("utf-8")
+    # Write straight into a bytes buffer so the (transcript-heavy) CSV isn't held as str and bytes at once
+    csv_buf = io.BytesIO()
+    df.to_csv(csv_buf, index=False, encoding="utf-8")
+    csv_bytes = csv_buf.getvalue()
     st.download_button(
         "⬇️ Download CSV",
         data=csv_bytes,
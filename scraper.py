@@ -1,17 +1,35 @@
 \
 from __future__ import annotations
 
+import atexit
+import heapq
+import html
+import io
+import json
 import os
+import random
 import re
+import shutil
+import sqlite3
 import tempfile
+import threading
 from pathlib import Path
 import time
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from itertools import groupby
+from operator import attrgetter
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from xml.etree import ElementTree
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.model import JsonModel
 
 # --- youtube-transcript-api imports (robust across versions) ---
 try:
@@ -33,6 +51,12 @@ except Exception:  # pragma: no cover
         CouldNotRetrieveTranscript,
     )
 
+# Internal fetcher that accepts our own requests.Session (get_transcript opens a new one per call)
+try:
+    from youtube_transcript_api._transcripts import TranscriptListFetcher  # type: ignore
+except Exception:  # pragma: no cover
+    TranscriptListFetcher = None  # type: ignore
+
 # Optional: yt-dlp fallback for subtitle extraction (requires a cookies.txt)
 # Only use this for videos you are authorized to access.
 try:  # pragma: no cover
@@ -40,10 +64,59 @@ try:  # pragma: no cover
 except Exception:  # pragma: no cover
     YoutubeDL = None  # type: ignore
 
+# Optional: orjson decodes YouTube Data API responses faster than stdlib json
+try:  # pragma: no cover
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
 
-YOUTUBE_URL_RE = re.compile(r"^https?://(www\.)?youtube\.com/.*", re.I)
+# Optional: lxml parses srv/ttml caption XML in C; stdlib ElementTree is the fallback
+try:  # pragma: no cover
+    from lxml import etree as _XML  # type: ignore
+    _XML_ERRORS = (_XML.XMLSyntaxError, ValueError)
+except Exception:  # pragma: no cover
+    _XML = None  # type: ignore
+    _XML_ERRORS = ()
 
 
+YOUTUBE_URL_RE = re.compile(r"^https?://(www\.)?youtube\.com/.*", re.I)
+# Channel URL shapes, tried in order: /@handle, /channel/UC..., /user/Name, /c/Name, /Name
+CHANNEL_URL_SHAPE_RE = re.compile(
+    r"youtube\.com/(?:@(?P<handle>[^/]+)|channel/(?P<channel_id>[^/]+)"
+    r"|user/(?P<user>[^/]+)|c/(?P<custom>[^/]+)|(?P<tail>[^/]+)$)",
+    re.I,
+)
+
+# Subtitle cleanup patterns (run once per fallback transcript)
+TAG_RE = re.compile(r"<[^>]+>")
+# Non-caption lines in .vtt/.srt: cue ids and timings (markup-only lines are empty once tags are stripped)
+CUE_SKIP_RE = re.compile(r"\d+$|.*-->")
+# VTT header (incl. YouTube's "Kind:"/"Language:" lines) and NOTE/STYLE/REGION blocks: they start
+# after a blank line, run until the next one and carry no caption text
+VTT_BLOCK_RE = re.compile(r"(?:WEBVTT|NOTE|STYLE|REGION)(?:\s|$)")
+WS_RE = re.compile(r"\s+")
+XML_CUE_RE = re.compile(r"<(?:p|text)\b[^>]*>(.*?)</(?:p|text)>", re.S | re.I)
+
+# Shared keep-alive session for transcript fetches, so videos reuse TCP+TLS connections to youtube.com.
+# Connection drops and 429/5xx answers are retried in the adapter (honouring Retry-After).
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=50,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False,  # hand the final response back so the library reports it as before
+        ),
+    ),
+)
+atexit.register(_SESSION.close)
+
+
+@lru_cache(maxsize=256)
 def normalize_channel_url(url: str) -> str:
     """Normalize common channel URL shapes (incl. @handle)."""
     url = (url or "").strip()
@@ -59,96 +132,234 @@ def normalize_channel_url(url: str) -> str:
     return url
 
 
-def _extract_handle_or_channel_id(channel_url: str) -> Tuple[Optional[str], Optional[str]]:
+@lru_cache(maxsize=256)
+def _channel_url_shape(channel_url: str) -> Tuple[Optional[str], Optional[str]]:
     """
-    Returns (handle, channel_id) if present.
-    - https://www.youtube.com/@davisfacts -> handle="davisfacts"
-    - https://www.youtube.com/channel/UCxxxx -> channel_id="UCxxxx"
+    Returns (kind, name) for a channel URL, kind being one of
+    "channel_id", "handle", "user" or "custom" (legacy /c/Name and bare /Name); (None, None) otherwise.
+    - https://www.youtube.com/@davisfacts -> ("handle", "davisfacts")
+    - https://www.youtube.com/channel/UCxxxx -> ("channel_id", "UCxxxx")
+    - https://www.youtube.com/user/Name -> ("user", "Name")
     """
     channel_url = normalize_channel_url(channel_url)
 
-    m = re.search(r"youtube\.com/@([^/]+)", channel_url, re.I)
-    if m:
-        return m.group(1), None
-
-    m = re.search(r"youtube\.com/channel/([^/]+)", channel_url, re.I)
-    if m:
-        return None, m.group(1)
+    m = CHANNEL_URL_SHAPE_RE.search(channel_url)
+    if not m:
+        return None, None
+    for kind in ("channel_id", "handle", "user", "custom"):
+        if m[kind]:
+            return kind, m[kind]
+    if m["tail"] not in {"watch", "shorts"}:
+        return "custom", m["tail"]
+    return None, None
 
-    # legacy username / custom url: /c/Name or /user/Name or /Name
-    m = re.search(r"youtube\.com/(c|user)/([^/]+)", channel_url, re.I)
-    if m:
-        return m.group(2), None
 
-    m = re.search(r"youtube\.com/([^/]+)$", channel_url, re.I)
-    if m and m.group(1) not in {"watch", "shorts"}:
-        return m.group(1), None
+class _OrjsonModel(JsonModel):
+    """JsonModel that decodes response bodies with orjson when it is installed."""
 
-    return None, None
+    def deserialize(self, content):
+        if orjson is None:
+            return super().deserialize(content)
+        try:
+            body = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return super().deserialize(content)
+        if self._data_wrapper and isinstance(body, dict) and "data" in body:
+            body = body["data"]
+        return body
 
 
 def _build_yt(api_key: str):
-    return build("youtube", "v3", developerKey=api_key, cache_discovery=False)
+    return build("youtube", "v3", developerKey=api_key, cache_discovery=False, model=_OrjsonModel())
 
 
-def _resolve_channel_id(api_key: str, channel_url: str, debug: List[str]) -> str:
-    handle, channel_id = _extract_handle_or_channel_id(channel_url)
+CACHE_DIR = Path(os.getenv("YT_SCRAPER_CACHE_DIR") or Path.home() / ".cache" / "yt_scraper")
+CHANNEL_CACHE_TTL = 7 * 86400
 
-    if channel_id:
-        debug.append(f"Resolved channel id from URL: {channel_id}")
-        return channel_id
 
-    yt = _build_yt(api_key)
+class _ChannelCache:
+    """
+    Handle -> channel id and channel id -> (uploads playlist, title) practically never change,
+    so keep them in memory and mirror them to a small JSON file; re-scrapes of the same channel,
+    in this process or a later one, skip those API calls (and their quota).
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+        self._data: Optional[Dict[str, Dict[str, list]]] = None
+
+    def _load(self) -> Dict[str, Dict[str, list]]:
+        if self._data is None:
+            try:
+                data = json.loads(self._path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                data = {}
+            if not isinstance(data, dict):
+                data = {}
+            data.setdefault("channel_ids", {})
+            data.setdefault("uploads", {})
+            self._data = data
+        return self._data
+
+    def get(self, kind: str, key: str) -> Optional[list]:
+        """Cached values for `key` (without the timestamp), or None when missing or stale."""
+        with self._lock:
+            entry = self._load()[kind].get(key)
+        if not entry or entry[-1] < time.time() - CHANNEL_CACHE_TTL:
+            return None
+        return entry[:-1]
+
+    def put(self, kind: str, key: str, *values) -> None:
+        with self._lock:
+            self._load()[kind][key] = [*values, int(time.time())]
+            # best effort: an unwritable cache dir only costs the API calls next run
+            try:
+                self._path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self._path.with_suffix(".tmp")
+                tmp.write_text(json.dumps(self._data), encoding="utf-8")
+                os.replace(tmp, self._path)
+            except OSError:
+                pass
+
+
+_CHANNEL_CACHE = _ChannelCache(CACHE_DIR / "channels.json")
+
+
+def _resolve_channel_id(yt, channel_url: str, debug: List[str]) -> str:
+    kind, name = _channel_url_shape(channel_url)
+
+    if kind == "channel_id":
+        debug.append(f"Resolved channel id from URL: {name}")
+        return name
 
     # If we have a handle/custom identifier, use search to find channel id
-    query = handle or channel_url
+    query = name or channel_url
+    # Key on the URL shape too: @Foo, /user/Foo and /c/Foo can be three different channels.
+    cache_key = f"{kind}:{name}" if kind else normalize_channel_url(channel_url)
+    cached = _CHANNEL_CACHE.get("channel_ids", cache_key)
+    if cached:
+        debug.append(f"Resolved channel id from cache: {cached[0]}")
+        return cached[0]
+
+    # Exact lookups first: channels.list costs 1 quota unit, search.list costs 100.
+    # Only @handles and /user/ names have one; /c/ and bare custom names can belong to
+    # a different channel than the same-named @handle, so those go straight to search.
+    lookup = {"handle": "forHandle", "user": "forUsername"}.get(kind)
+    if lookup:
+        try:
+            resp = yt.channels().list(part="id", fields="items/id", **{lookup: name}).execute()
+        except HttpError as e:
+            debug.append(f"{lookup} lookup HttpError: {e}")
+            resp = {}
+        items = resp.get("items", [])
+        if items:
+            ch_id = items[0]["id"]
+            debug.append(f"Resolved channel id via {lookup}: {ch_id}")
+            _CHANNEL_CACHE.put("channel_ids", cache_key, ch_id)
+            return ch_id
+
     debug.append(f"Resolving channel via search: q={query!r}")
 
     try:
-        resp = yt.search().list(part="snippet", q=query, type="channel", maxResults=1).execute()
+        resp = yt.search().list(
+            part="snippet", q=query, type="channel", maxResults=1, fields="items/snippet/channelId"
+        ).execute()
         items = resp.get("items", [])
         if not items:
             raise ValueError("Could not resolve channel. Try using the /channel/UC... URL.")
         ch_id = items[0]["snippet"]["channelId"]
         debug.append(f"Resolved channel id via search: {ch_id}")
+        _CHANNEL_CACHE.put("channel_ids", cache_key, ch_id)
         return ch_id
     except HttpError as e:
         debug.append(f"Channel resolve HttpError: {e}")
         raise
 
 
+def _get_uploads_playlist(yt, channel_id: str, debug: List[str]) -> Tuple[str, Optional[str]]:
+    """Returns (uploads_playlist_id, channel_title) for a channel id."""
+    cached = _CHANNEL_CACHE.get("uploads", channel_id)
+    if cached:
+        debug.append(f"Channel: {cached[1]} | uploads={cached[0]} (cached)")
+        return cached[0], cached[1]
+
+    debug.append("Fetching channel contentDetails to locate uploads playlist...")
+    ch = yt.channels().list(
+        part="contentDetails,snippet,statistics",
+        id=channel_id,
+        maxResults=1,
+        fields="items(contentDetails/relatedPlaylists/uploads,snippet/title,statistics/subscriberCount)",
+    ).execute()
+    ch_items = ch.get("items", [])
+    if not ch_items:
+        raise ValueError("Channel not found or not accessible.")
+    uploads_pl = ch_items[0]["contentDetails"]["relatedPlaylists"]["uploads"]
+    channel_title = ch_items[0].get("snippet", {}).get("title")
+    channel_subs = ch_items[0].get("statistics", {}).get("subscriberCount")
+
+    debug.append(f"Channel: {channel_title} | subs={channel_subs} | uploads={uploads_pl}")
+    _CHANNEL_CACHE.put("uploads", channel_id, uploads_pl, channel_title)
+    return uploads_pl, channel_title
+
+
+@lru_cache(maxsize=1024)
 def _parse_iso8601_duration_to_seconds(duration: str) -> Optional[int]:
-    # PT#M#S format; may also contain hours
+    # PT#M#S format; may also contain hours. Single pass over the characters, no regex.
+    # Memoised: a channel's durations repeat a lot (Shorts especially), and both the
+    # pre-screen and the full fetch parse every kept video's duration.
     if not duration or not duration.startswith("PT"):
         return None
-    hours = minutes = seconds = 0
-    m = re.search(r"(\d+)H", duration)
-    if m:
-        hours = int(m.group(1))
-    m = re.search(r"(\d+)M", duration)
-    if m:
-        minutes = int(m.group(1))
-    m = re.search(r"(\d+)S", duration)
-    if m:
-        seconds = int(m.group(1))
-    return hours * 3600 + minutes * 60 + seconds
+    total = 0
+    n = 0
+    for c in duration[2:]:
+        if "0" <= c <= "9":
+            n = n * 10 + ord(c) - 48
+        elif c == "H":
+            total += n * 3600
+            n = 0
+        elif c == "M":
+            total += n * 60
+            n = 0
+        elif c == "S":
+            total += n
+            n = 0
+        else:
+            n = 0
+    return total
+
+
+@lru_cache(maxsize=32)
+def _normalized_langs(languages: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Stripped, de-duplicated language codes in priority order; English when none are given."""
+    langs = tuple(dict.fromkeys(l.strip() for l in languages if l and l.strip()))
+    return langs or ("en",)
+
+
+def _fetch_transcript_parts(video_id: str, languages: List[str]) -> List[Dict]:
+    """youtube-transcript-api's get_transcript, but over the shared pooled session."""
+    if TranscriptListFetcher is None:
+        return YouTubeTranscriptApi.get_transcript(video_id, languages=languages)  # type: ignore
+    return TranscriptListFetcher(_SESSION).fetch(video_id).find_transcript(languages).fetch()
 
 
 def _get_transcript_text(
     video_id: str,
     languages: Optional[List[str]] = None,
     cookies_txt_path: Optional[str] = None,
-) -> Tuple[Optional[str], Optional[str]]:
+    fallback: Optional[_YtDlpFallback] = None,
+) -> Tuple[Optional[str], Optional[str], bool]:
     """
-    Returns (transcript_text, error_string).
+    Returns (transcript_text, error_string, via_cookies).
+    via_cookies is True when the text came from the cookies-backed yt-dlp fallback.
     """
     languages = languages or ["en"]
 
     # Primary path: youtube-transcript-api (fast + simple)
     try:
-        parts = YouTubeTranscriptApi.get_transcript(video_id, languages=languages)  # type: ignore
-        text = " ".join([p.get("text", "") for p in parts]).strip()
-        return (text if text else None), None
+        parts = _fetch_transcript_parts(video_id, languages)
+        text = " ".join(s for s in (p.get("text", "").replace("\n", " ").strip() for p in parts) if s)
+        return (text if text else None), None, False
     except (TranscriptsDisabled, NoTranscriptFound, VideoUnavailable, TooManyRequests, CouldNotRetrieveTranscript) as e:
         primary_err = f"{type(e).__name__}"
     except Exception as e:
@@ -157,98 +368,538 @@ def _get_transcript_text(
     # Fallback path (optional): yt-dlp with user-provided cookies
     if cookies_txt_path and YoutubeDL is not None:
         try:
-            fallback_text = _get_subtitle_text_via_ytdlp(video_id, languages=languages, cookies_txt_path=cookies_txt_path)
+            fallback_text = _get_subtitle_text_via_ytdlp(
+                video_id, languages=languages, cookies_txt_path=cookies_txt_path, fallback=fallback
+            )
             if fallback_text:
-                return fallback_text, None
+                return fallback_text, None, True
         except Exception as e:  # keep primary error as the surfaced reason
-            return None, f"{primary_err} (+CookiesFallbackFailed: {type(e).__name__})"
+            return None, f"{primary_err} (+CookiesFallbackFailed: {type(e).__name__})", False
 
-    return None, primary_err
+    return None, primary_err, False
 
 
-def _vtt_or_srt_to_text(raw: str) -> str:
-    """Best-effort cleanup for .vtt/.srt subtitle files."""
-    out: List[str] = []
-    for line in raw.splitlines():
+def _vtt_or_srt_cue_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Yield the caption text lines of a .vtt/.srt file, skipping headers, timings and cue ids."""
+    skip = CUE_SKIP_RE.match
+    block_start = VTT_BLOCK_RE.match
+    in_block = False
+    after_blank = True
+    for line in lines:
         s = line.strip()
         if not s:
+            in_block = False
+            after_blank = True
             continue
-        if s.startswith("WEBVTT"):
-            continue
-        if "-->" in s:
+        if after_blank and block_start(s):
+            in_block = True
+        after_blank = False
+        if in_block or skip(s):
             continue
-        if s.isdigit():
-            continue
-        if s.startswith("NOTE"):
-            continue
-        # basic cue settings cleanup
-        if s.startswith("<") and s.endswith(">"):
-            continue
-        out.append(s)
-    text = " ".join(out)
-    # Remove leftover markup-ish tags
-    text = re.sub(r"<[^>]+>", "", text)
-    text = re.sub(r"\s+", " ", text).strip()
+        # Strip inline tags per line: rolling auto-captions show a line once with word timings
+        # (so<00:00:00.480><c> today</c>) and then plain, and both copies must compare equal.
+        if "<" in s:
+            s = WS_RE.sub(" ", TAG_RE.sub("", s)).strip()
+            if not s:
+                continue
+        yield s
+
+
+def _vtt_or_srt_to_text(raw: Union[str, Iterable[str]]) -> str:
+    """Best-effort cleanup for .vtt/.srt subtitles, given as a string or an iterable of lines (e.g. a file)."""
+    if isinstance(raw, str):
+        raw = raw.lstrip("\ufeff").splitlines()
+    # Auto-generated captions repeat each line across consecutive cues; keep one copy.
+    text = " ".join(k for k, _ in groupby(_vtt_or_srt_cue_lines(raw)))
+    # Decode entities (&amp;, &#39;, ...) once over the joined text; auto captions rarely contain any.
+    if "&" in text:
+        text = html.unescape(text)
+    text = WS_RE.sub(" ", text).strip()
     return text
 
 
+def _sniff_subtitle_format(raw: str) -> str:
+    """Guess the subtitle format from the payload itself: vtt | srt | xml | json3 | unknown.
+
+    yt-dlp falls back to whatever format YouTube offers when vtt/srt are missing,
+    so the file extension is not a reliable hint.
+    """
+    head = raw.lstrip("\ufeff \t\r\n")[:256]
+    if head.startswith("WEBVTT"):
+        return "vtt"
+    if head.startswith("{"):
+        return "json3"
+    if head.startswith("<"):
+        return "xml"
+    if "-->" in head:
+        return "srt"
+    return "unknown"
+
+
+def _xml_subtitle_to_text(raw: str = "", path: Optional[str] = None) -> str:
+    """Extract caption text from srv1/srv2/srv3/ttml XML, given as a string or a file path.
+
+    Parsed incrementally and each cue is cleared once read, so long captions never sit in
+    memory as a full tree.
+    """
+    parts: List[str] = []
+    etree = _XML if _XML is not None else ElementTree
+    # lxml refuses str input that carries an encoding declaration, so hand it bytes
+    source = path if path is not None else io.BytesIO(raw.encode("utf-8"))
+    try:
+        for _, el in etree.iterparse(source, events=("end",)):
+            # srv1 uses <text>, srv3 and ttml use <p> (ttml with a namespace prefix)
+            tag = el.tag.rsplit("}", 1)[-1] if isinstance(el.tag, str) else ""
+            if tag in ("p", "text"):
+                cue = " ".join(el.itertext())
+                # srv1 escapes its cue text twice, so one layer of entities survives the parser
+                if tag == "text" and "&" in cue:
+                    cue = html.unescape(cue)
+                parts.append(cue)
+                el.clear()
+    except (ElementTree.ParseError, *_XML_ERRORS):
+        if path is not None:
+            raw = Path(path).read_text(encoding="utf-8-sig", errors="ignore")
+        # the regex sees raw markup, so entities still need decoding here
+        parts = [html.unescape(p) if "&" in p else p for p in XML_CUE_RE.findall(raw)]
+    text = " ".join(k for k, _ in groupby(p.strip() for p in parts if p and p.strip()))
+    if "<" in text:
+        text = TAG_RE.sub("", text)
+    return WS_RE.sub(" ", text).strip()
+
+
+def _json3_subtitle_to_text(raw: str) -> str:
+    """Extract caption text from YouTube's json3 subtitle format."""
+    # orjson.JSONDecodeError subclasses ValueError, same as json's, so callers catch either
+    obj = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    lines = (
+        "".join(seg.get("utf8", "") for seg in ev.get("segs") or []).replace("\n", " ").strip()
+        for ev in obj.get("events") or []
+    )
+    text = " ".join(k for k, _ in groupby(line for line in lines if line))
+    return WS_RE.sub(" ", text).strip()
+
+
+def _subtitle_to_text(raw: str) -> str:
+    """Dispatch on the sniffed format rather than the file extension."""
+    fmt = _sniff_subtitle_format(raw)
+    if fmt == "xml":
+        return _xml_subtitle_to_text(raw)
+    if fmt == "json3":
+        try:
+            return _json3_subtitle_to_text(raw)
+        except ValueError:
+            return ""
+    return _vtt_or_srt_to_text(raw)
+
+
+def _subtitle_file_to_text(path: str) -> str:
+    """_subtitle_to_text for a file; .vtt/.srt and XML are processed without loading the whole file."""
+    # utf-8-sig drops a leading BOM, which would otherwise hide the WEBVTT header
+    with open(path, encoding="utf-8-sig", errors="ignore") as f:
+        fmt = _sniff_subtitle_format(f.read(512))
+        f.seek(0)
+        if fmt == "json3":
+            return _subtitle_to_text(f.read())
+        if fmt != "xml":
+            return _vtt_or_srt_to_text(f)
+    return _xml_subtitle_to_text(path=path)
+
+
+def _expand_subtitle_langs(languages: Optional[List[str]]) -> List[str]:
+    """Expand language list to common variants (yt-dlp expects BCP47-ish strings)."""
+    expanded: List[str] = []
+    for l in _normalized_langs(tuple(languages or ())):
+        expanded.append(l)
+        if l.lower() == "en":
+            expanded.extend(["en-US", "en-GB"])
+    return expanded
+
+
+def _build_subtitle_ydl(languages: Optional[List[str]], cookies_txt_path: str):
+    """Create a yt-dlp instance for subtitle-only downloads."""
+    ydl_opts = {
+        "skip_download": True,
+        "writesubtitles": True,
+        "writeautomaticsub": True,
+        "subtitleslangs": _expand_subtitle_langs(languages),
+        "subtitlesformat": "vtt/srt",
+        "outtmpl": "%(id)s.%(ext)s",
+        "cookiefile": cookies_txt_path,
+        "quiet": True,
+        "no_warnings": True,
+    }
+    return YoutubeDL(ydl_opts)
+
+
+_SUBTITLE_EXTS = (".vtt", ".srt", ".srv1", ".srv2", ".srv3", ".ttml", ".json3", ".xml")
+
+
+class _YtDlpFallback:
+    """One yt-dlp instance and one scratch directory shared by every fallback download of a scrape.
+
+    Constructing YoutubeDL parses the cookies.txt and loads the extractors, so it is
+    built once. It is not thread-safe, so downloads are serialised; each video's files
+    carry its id as a prefix and are deleted as soon as they have been read.
+    """
+
+    def __init__(self, languages: Optional[List[str]], cookies_txt_path: str):
+        self._ydl = _build_subtitle_ydl(languages, cookies_txt_path)
+        self._lock = threading.Lock()
+        self._tmpdir: Optional[str] = None
+
+    def fetch_text(self, video_id: str) -> Optional[str]:
+        url = f"https://www.youtube.com/watch?v={video_id}"
+        with self._lock:
+            if self._tmpdir is None:
+                self._tmpdir = tempfile.mkdtemp(prefix="yt_subs_")
+                self._ydl.params["paths"] = {"home": self._tmpdir}
+            tmpdir = self._tmpdir
+            info = self._ydl.extract_info(url, download=True) or {}
+
+        # yt-dlp reports where it wrote each subtitle; only scan the directory if it didn't
+        reported = [sub.get("filepath") for sub in (info.get("requested_subtitles") or {}).values()]
+        reported = [p for p in reported if p and os.path.isfile(p)]
+        if reported:
+            produced = [(os.path.getsize(p), p) for p in reported]
+        else:
+            prefix = video_id + "."
+            with os.scandir(tmpdir) as it:
+                produced = [(e.stat().st_size, e.path) for e in it if e.name.startswith(prefix)]
+        try:
+            # Pick the largest subtitle file produced (usually the most complete)
+            candidates = [c for c in produced if c[1].endswith(_SUBTITLE_EXTS)]
+            if not candidates:
+                return None
+            text = _subtitle_file_to_text(max(candidates)[1])
+        finally:
+            for _, path in produced:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+        return text if text else None
+
+    def close(self) -> None:
+        # YoutubeDL.close() also writes back any refreshed cookies
+        self._ydl.close()
+        if self._tmpdir is not None:
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+            self._tmpdir = None
+
+    def __enter__(self) -> "_YtDlpFallback":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
 def _get_subtitle_text_via_ytdlp(
     video_id: str,
     languages: Optional[List[str]],
     cookies_txt_path: str,
+    fallback: Optional[_YtDlpFallback] = None,
 ) -> Optional[str]:
     """Attempt to fetch subtitles using yt-dlp.
 
     This is only intended as a fallback when youtube-transcript-api fails.
-    Requires a cookies.txt in Netscape format.
+    Requires a cookies.txt in Netscape format. Pass ``fallback`` (a
+    ``_YtDlpFallback``) to reuse one yt-dlp instance across videos.
     """
     if YoutubeDL is None:
         return None
+    if fallback is None:
+        with _YtDlpFallback(languages, cookies_txt_path) as own:
+            return own.fetch_text(video_id)
+    return fallback.fetch_text(video_id)
+
+
+@dataclass(slots=True)
+class VideoRow:
+    """One output row. Kept as a slotted dataclass while scraping; callers get plain dicts."""
+
+    video_id: str
+    url: str
+    title: Optional[str]
+    published_at: Optional[str]
+    duration_seconds: Optional[int]
+    view_count: int
+    like_count: int
+    comment_count: int
+    channel_title: Optional[str]
+    channel_id: str
+    tags: str
+    thumbnail: Optional[str]
+    rank: int = 0
+    transcript: Optional[str] = None
+    transcript_error: Optional[str] = None
+
+    def as_dict(self) -> Dict:
+        # cheaper than dataclasses.asdict, which deep-copies every value
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def _to_int(value, default: int = 0) -> int:
+    """API counters arrive as strings and may be missing (e.g. hidden likes)."""
+    return int(value) if value else default
+
+
+def _passes_filters(v: Dict, content_type: str, min_views: int) -> Optional[Tuple[int, Optional[int]]]:
+    """
+    Apply min_views and the content_type duration filter to a videos.list item.
+    Returns (view_count, duration_seconds) when the video is kept, else None.
+    Only needs the statistics and contentDetails parts.
+    """
+    stats = v.get("statistics", {}) or {}
+    view_count = _to_int(stats.get("viewCount"))
+    if view_count < min_views:
+        return None
 
-    import tempfile
+    duration = (v.get("contentDetails", {}) or {}).get("duration")
+    seconds = _parse_iso8601_duration_to_seconds(duration) if duration else None
 
-    # Expand language list to common variants (yt-dlp expects BCP47-ish strings)
-    langs = languages or ["en"]
-    expanded: List[str] = []
-    for l in langs:
-        l = (l or "").strip()
-        if not l:
-            continue
-        expanded.append(l)
-        if l.lower() == "en":
-            expanded.extend(["en-US", "en-GB"])
+    # content_type filter
+    if content_type == "shorts" and seconds is not None and seconds > 60:
+        return None
+    if content_type == "videos" and seconds is not None and seconds <= 60:
+        return None
+    return view_count, seconds
+
+
+def _video_to_row(
+    v: Dict,
+    channel_title: Optional[str],
+    channel_id: str,
+    content_type: str,
+    min_views: int,
+) -> Optional[VideoRow]:
+    """Turn one videos.list item into an output row, or None if it is filtered out."""
+    # Apply the cheap filters first so rejected videos cost nothing beyond the API payload.
+    passed = _passes_filters(v, content_type, min_views)
+    if passed is None:
+        return None
+    view_count, seconds = passed
+
+    vid = v["id"]
+    stats = v.get("statistics", {}) or {}
+    snippet = v.get("snippet", {}) or {}
+    tags = snippet.get("tags", [])
+    thumbnails = snippet.get("thumbnails", {}) or {}
+    # best available resolution first
+    thumb = (
+        thumbnails.get("maxres")
+        or thumbnails.get("standard")
+        or thumbnails.get("high")
+        or thumbnails.get("medium")
+        or thumbnails.get("default")
+        or {}
+    ).get("url")
+
+    return VideoRow(
+        video_id=vid,
+        url=f"https://www.youtube.com/watch?v={vid}",
+        title=snippet.get("title"),
+        published_at=snippet.get("publishedAt"),
+        duration_seconds=seconds,
+        view_count=view_count,
+        like_count=_to_int(stats.get("likeCount")),
+        comment_count=_to_int(stats.get("commentCount")),
+        channel_title=channel_title,
+        channel_id=channel_id,
+        tags=",".join(map(str, tags)) if isinstance(tags, list) else (tags or ""),
+        thumbnail=thumb,
+    )
 
-    url = f"https://www.youtube.com/watch?v={video_id}"
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        ydl_opts = {
-            "skip_download": True,
-            "writesubtitles": True,
-            "writeautomaticsub": True,
-            "subtitleslangs": expanded or ["en"],
-            "subtitlesformat": "vtt/srt",
-            "outtmpl": os.path.join(tmpdir, "%(id)s.%(ext)s"),
-            "cookiefile": cookies_txt_path,
-            "quiet": True,
-            "no_warnings": True,
-        }
-        with YoutubeDL(ydl_opts) as ydl:
-            ydl.download([url])
-
-        # Pick the largest subtitle file produced (usually the most complete)
-        candidates: List[str] = []
-        for fn in os.listdir(tmpdir):
-            if not fn.startswith(video_id + "."):
-                continue
-            if fn.endswith((".vtt", ".srt")):
-                candidates.append(os.path.join(tmpdir, fn))
-        if not candidates:
+
+_TRANSCRIPT_ATTEMPTS = 3
+
+# Transcripts of published videos practically never change, so keep them on disk between runs.
+TRANSCRIPT_CACHE_TTL = 7 * 86400
+# "No transcript" answers are cached too, but only briefly (captions can be added later) and only
+# for definitive errors; transient ones such as TooManyRequests are always retried next run.
+TRANSCRIPT_ERROR_CACHE_TTL = 86400
+_CACHEABLE_ERRORS = {"TranscriptsDisabled", "NoTranscriptFound", "VideoUnavailable"}
+
+
+class _TranscriptCache:
+    """
+    Small sqlite-backed store of transcript results keyed by (video_id, languages).
+    Transcript text is stored zlib-compressed (plain text is highly repetitive, so this
+    shrinks the file several-fold).
+    """
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS transcripts ("
+            "video_id TEXT, langs TEXT, text BLOB, err TEXT, ts INTEGER, PRIMARY KEY (video_id, langs))"
+        )
+        self._db.commit()
+
+    def get(self, video_id: str, langs: str) -> Optional[Tuple[Optional[str], Optional[str]]]:
+        """Returns (text, err) for a fresh entry, else None."""
+        now = int(time.time())
+        # best effort, like _ChannelCache: a locked, full or corrupted database is just a miss
+        try:
+            with self._lock:
+                row = self._db.execute(
+                    "SELECT text, err, ts FROM transcripts WHERE video_id=? AND langs=?",
+                    (video_id, langs),
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+        if not row:
             return None
+        text, err, ts = row
+        ttl = TRANSCRIPT_ERROR_CACHE_TTL if err else TRANSCRIPT_CACHE_TTL
+        if ts < now - ttl:
+            return None
+        if text is not None:
+            try:
+                text = zlib.decompress(text).decode("utf-8")
+            except (zlib.error, UnicodeDecodeError):
+                return None
+        return text, err
+
+    def put(self, video_id: str, langs: str, text: Optional[str], err: Optional[str]) -> None:
+        if not text and err not in _CACHEABLE_ERRORS:
+            return
+        row = (
+            video_id,
+            langs,
+            zlib.compress(text.encode("utf-8")) if text else None,
+            None if text else err,
+            int(time.time()),
+        )
+        with self._lock:
+            # best effort: a failed write only costs a re-fetch next run, never the scrape
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO transcripts (video_id, langs, text, err, ts) VALUES (?, ?, ?, ?, ?)",
+                    row,
+                )
+                self._db.commit()
+            except sqlite3.Error:
+                try:
+                    self._db.rollback()
+                except sqlite3.Error:
+                    pass
+
+
+_TRANSCRIPT_CACHE: Optional[_TranscriptCache] = None
+_TRANSCRIPT_CACHE_LOCK = threading.Lock()
+
+
+def _get_transcript_cache(debug: List[str]) -> Optional[_TranscriptCache]:
+    """Open the shared transcript cache once; None if the cache dir is not writable."""
+    global _TRANSCRIPT_CACHE
+    with _TRANSCRIPT_CACHE_LOCK:
+        if _TRANSCRIPT_CACHE is None:
+            try:
+                _TRANSCRIPT_CACHE = _TranscriptCache(CACHE_DIR / "transcripts.sqlite3")
+            except (OSError, sqlite3.Error) as e:
+                debug.append(f"Transcript cache disabled: {e}")
+                return None
+        return _TRANSCRIPT_CACHE
+
+
+class _RateLimitGate:
+    """
+    Shared pause for transcript workers. When YouTube answers TooManyRequests,
+    every worker holds off (exponential backoff with jitter, capped at 60s)
+    instead of the other threads carrying on hammering the same host.
+    """
 
-        best = max(candidates, key=lambda p: os.path.getsize(p))
-        raw = open(best, "r", encoding="utf-8", errors="ignore").read()
-        text = _vtt_or_srt_to_text(raw)
-        return text if text else None
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+        self._strikes = 0
+
+    def wait(self) -> None:
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def hit(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            # Workers rate-limited together report together; escalate once per backoff window.
+            if now < self._resume_at:
+                return
+            self._strikes += 1
+            delay = min(2.0 ** self._strikes, 60.0) + random.uniform(0, 1)
+            self._resume_at = now + delay
+
+    def clear(self) -> None:
+        with self._lock:
+            # Only a success after the pause proves the limit lifted; one straggler that got
+            # through during partial throttling must not reset the backoff.
+            if time.monotonic() >= self._resume_at:
+                self._strikes = 0
+
+
+# Partial-response masks: only the fields _passes_filters/_video_to_row read, per videos.list part set.
+_VIDEO_FIELDS = {
+    "contentDetails,statistics": "items(id,statistics/viewCount,contentDetails/duration)",
+    "snippet,statistics,contentDetails": (
+        "items(id,snippet(title,publishedAt,tags,"
+        "thumbnails(maxres/url,standard/url,high/url,medium/url,default/url)),"
+        "statistics(viewCount,likeCount,commentCount),contentDetails/duration)"
+    ),
+}
+
+
+def _fetch_video_items(
+    yt,
+    video_ids: List[str],
+    debug: List[str],
+    part: str = "snippet,statistics,contentDetails",
+    sleep_every: int = 0,
+) -> List[Dict]:
+    """
+    Run videos.list for all ids (50 per call) and return the items in input order.
+    The calls go out as Google API HTTP batches, so N round-trips collapse into one.
+    With sleep_every, each batch holds that many calls and we pause 1s between batches.
+    """
+    chunks = [video_ids[i : i + 50] for i in range(0, len(video_ids), 50)]
+    per_batch = int(sleep_every) if sleep_every else 1000  # 1000 = Google's per-batch call limit
+    responses: Dict[str, Dict] = {}
+    errors: List[Exception] = []
+
+    def _collect(request_id, response, exception):
+        if exception is not None:
+            errors.append(exception)
+        else:
+            responses[request_id] = response
+
+    # The resource and the constant kwargs are the same for every chunk; only the ids change.
+    videos = yt.videos()
+    base_kwargs = {"part": part, "fields": _VIDEO_FIELDS.get(part)}
+
+    for start in range(0, len(chunks), per_batch):
+        if start:
+            time.sleep(1.0)
+        batch = yt.new_batch_http_request(callback=_collect)
+        for n in range(start, min(start + per_batch, len(chunks))):
+            chunk = chunks[n]
+            req = videos.list(id=",".join(chunk), maxResults=len(chunk), **base_kwargs)
+            batch.add(req, request_id=str(n))
+        batch.execute()
+        if errors:
+            debug.append(f"videos.list HttpError (batch {start}): {errors[0]}")
+            raise errors[0]
+
+    items: List[Dict] = []
+    for n in range(len(chunks)):
+        items.extend(responses.get(str(n), {}).get("items", []))
+    return items
+
+
+def _close_after_pool(pool: ThreadPoolExecutor, fallback: _YtDlpFallback) -> None:
+    pool.shutdown()
+    fallback.close()
 
 
 def scrape_channel(
@@ -263,13 +914,23 @@ def scrape_channel(
     cookies_txt_path: Optional[str] = None,
     sleep_every: int = 0,
     debug: Optional[List[str]] = None,
+    transcript_workers: int = 8,
+    force_refresh: bool = False,
+    top_k: Optional[int] = None,
+    progress_cb: Optional[Callable[[float, str], None]] = None,
 ):
     """
     Scrape a channel's videos (metadata + optional transcripts) using YouTube Data API v3 + youtube-transcript-api.
+    Transcripts are fetched concurrently by up to `transcript_workers` threads and cached on disk;
+    without `top_k` they start as soon as the video ids are known, alongside the metadata fetch;
+    `force_refresh` skips cache reads (fresh results are still written back).
+    `top_k` keeps only the first N rows after ordering, so transcripts are fetched for those alone.
+    `progress_cb(fraction, message)` is called from the calling thread as each stage completes.
     Returns a list of rows (dicts).
     """
     debug = debug if debug is not None else []
     channel_url = normalize_channel_url(channel_url)
+    progress = progress_cb or (lambda fraction, message: None)
 
     if not api_key:
         raise ValueError("YouTube Data API key is required.")
@@ -282,24 +943,19 @@ def scrape_channel(
     if content_type not in {"shorts", "videos", "both"}:
         content_type = "both"
 
-    channel_id = _resolve_channel_id(api_key, channel_url, debug)
+    # One client for the whole run; building it re-parses the discovery document.
     yt = _build_yt(api_key)
+    channel_id = _resolve_channel_id(yt, channel_url, debug)
 
-    # Step 1: get uploads playlist
-    debug.append("Fetching channel contentDetails to locate uploads playlist...")
-    ch = yt.channels().list(part="contentDetails,snippet,statistics", id=channel_id, maxResults=1).execute()
-    ch_items = ch.get("items", [])
-    if not ch_items:
-        raise ValueError("Channel not found or not accessible.")
-    uploads_pl = ch_items[0]["contentDetails"]["relatedPlaylists"]["uploads"]
-    channel_title = ch_items[0].get("snippet", {}).get("title")
-    channel_subs = ch_items[0].get("statistics", {}).get("subscriberCount")
+    progress(0.05, "Resolved channel")
 
-    debug.append(f"Channel: {channel_title} | subs={channel_subs} | uploads={uploads_pl}")
+    # Step 1: get uploads playlist
+    uploads_pl, channel_title = _get_uploads_playlist(yt, channel_id, debug)
 
     # Step 2: iterate playlist items to get video ids
     debug.append("Listing videos from uploads playlist...")
     video_ids: List[str] = []
+    seen_ids = set()
     next_token: Optional[str] = None
 
     while True:
@@ -308,10 +964,14 @@ def scrape_channel(
             playlistId=uploads_pl,
             maxResults=50,
             pageToken=next_token,
+            fields="items/contentDetails/videoId,nextPageToken",
         ).execute()
 
         for it in resp.get("items", []):
             vid = it["contentDetails"]["videoId"]
+            if vid in seen_ids:
+                continue
+            seen_ids.add(vid)
             video_ids.append(vid)
             if len(video_ids) >= scan_limit:
                 break
@@ -324,104 +984,129 @@ def scrape_channel(
             break
 
     debug.append(f"Collected {len(video_ids)} video ids.")
-
-    # If popular_first, we'll need stats; order by views after fetching
-    # Step 3: fetch details in batches
-    rows: List[Dict] = []
-    batch_size = 50
-    for i in range(0, len(video_ids), batch_size):
-        batch = video_ids[i : i + batch_size]
-        try:
-            vids = yt.videos().list(part="snippet,statistics,contentDetails", id=",".join(batch), maxResults=len(batch)).execute()
-        except HttpError as e:
-            debug.append(f"videos.list HttpError (batch {i}): {e}")
-            raise
-
-        for v in vids.get("items", []):
-            vid = v["id"]
-            snippet = v.get("snippet", {}) or {}
-            stats = v.get("statistics", {}) or {}
-            content_details = v.get("contentDetails", {}) or {}
-
-            title = snippet.get("title")
-            published = snippet.get("publishedAt")
-            tags = snippet.get("tags", [])
-            thumbnails = snippet.get("thumbnails", {}) or {}
-            thumb = None
-            for k in ("maxres", "standard", "high", "medium", "default"):
-                if k in thumbnails:
-                    thumb = thumbnails[k].get("url")
-                    if thumb:
-                        break
-
-            view_count = int(stats.get("viewCount", 0) or 0)
-            like_count = int(stats.get("likeCount", 0) or 0)
-            comment_count = int(stats.get("commentCount", 0) or 0)
-
-            duration = content_details.get("duration")
-            seconds = _parse_iso8601_duration_to_seconds(duration) if duration else None
-
-            # content_type filter
-            if content_type == "shorts" and seconds is not None and seconds > 60:
-                continue
-            if content_type == "videos" and seconds is not None and seconds <= 60:
-                continue
-
-            if view_count < min_views:
-                continue
-
-            row = {
-                "video_id": vid,
-                "url": f"https://www.youtube.com/watch?v={vid}",
-                "title": title,
-                "published_at": published,
-                "duration_seconds": seconds,
-                "view_count": view_count,
-                "like_count": like_count,
-                "comment_count": comment_count,
-                "channel_title": channel_title,
-                "channel_id": channel_id,
-                "tags": ",".join(tags) if isinstance(tags, list) else (tags or ""),
-                "thumbnail": thumb,
-            }
-            rows.append(row)
-
-        if sleep_every and (i // batch_size + 1) % int(sleep_every) == 0:
-            time.sleep(1.0)
-
-    debug.append(f"After filtering: {len(rows)} videos.")
-
-    # Sort popular-first
-    if popular_first:
-        rows.sort(key=lambda r: r.get("view_count", 0), reverse=True)
-    else:
-        # playlist order is newest-first typically; keep as is
-        pass
-
-    # Rank
-    for idx, r in enumerate(rows, start=1):
-        r["rank"] = idx
-
-    # Step 4: transcripts (optional)
+    progress(0.2, f"Collected {len(video_ids)} video ids")
+
+    # Step 2b: for Shorts-only scrapes, pre-screen with the light contentDetails+statistics parts
+    # so the heavy snippet (titles, tags, thumbnails) is only downloaded for videos that survive.
+    # Other filters usually keep most videos, where the extra pass would just cost quota.
+    if content_type == "shorts":
+        light = _fetch_video_items(yt, video_ids, debug, part="contentDetails,statistics", sleep_every=sleep_every)
+        keep = {v["id"] for v in light if _passes_filters(v, content_type, min_views) is not None}
+        video_ids = [vid for vid in video_ids if vid in keep]
+        debug.append(f"Pre-screen kept {len(video_ids)} video ids.")
+    # every remaining id is known to become a row (unless top_k trims them later)
+    ids_final = content_type == "shorts" or (content_type == "both" and not min_views)
+
+    top_k = int(top_k) if top_k and top_k > 0 else None
+
+    # Transcript workers are set up before the metadata fetch so they can start early (see below)
+    pool: Optional[ThreadPoolExecutor] = None
+    fallback: Optional[_YtDlpFallback] = None
     if include_transcripts:
-        debug.append("Fetching transcripts (where available)...")
+        workers = int(max(1, min(int(transcript_workers or 1), 32)))
+        # normalise the language list once for the whole run rather than per video
+        languages = list(_normalized_langs(tuple(transcript_languages or ())))
+        fallback = (
+            _YtDlpFallback(languages, cookies_txt_path)
+            if cookies_txt_path and YoutubeDL is not None
+            else None
+        )
+
+        gate = _RateLimitGate()
+        cache = _get_transcript_cache(debug)
+        langs_key = ",".join(languages)
+
+        def _fetch_one(video_id: str) -> Tuple[Optional[str], Optional[str]]:
+            if cache is not None and not force_refresh:
+                cached = cache.get(video_id, langs_key)
+                # a cached "no transcript" is not trusted when the cookies fallback could now succeed
+                if cached is not None and not (cached[1] and cookies_txt_path):
+                    return cached
+            for retries_left in reversed(range(_TRANSCRIPT_ATTEMPTS)):
+                gate.wait()
+                t, err, via_cookies = _get_transcript_text(
+                    video_id,
+                    languages=languages,
+                    cookies_txt_path=cookies_txt_path,
+                    fallback=fallback,
+                )
+                if not (err or "").startswith("TooManyRequests"):
+                    gate.clear()
+                    break
+                # rate-limited: pause every worker, then retry this video
+                if retries_left:
+                    gate.hit()
+            # Text fetched with the user's cookies stays in this run: the shared cache would
+            # otherwise serve it to later runs and sessions that supplied no cookies.
+            if cache is not None and not via_cookies:
+                cache.put(video_id, langs_key, t, err)
+            return t, err
+
+        pool = ThreadPoolExecutor(max_workers=workers)
+
+    completed = False
+    try:
+        futures: Dict[str, Future] = {}
+        if pool is not None and top_k is None and ids_final:
+            # Every id left here survives filtering, and transcripts don't depend on ranking,
+            # so start them now to overlap the metadata fetch.
+            debug.append(f"Fetching transcripts (where available) with {workers} workers...")
+            futures = {vid: pool.submit(_fetch_one, vid) for vid in video_ids}
+
+        # If popular_first, we'll need stats; order by views after fetching
+        # Step 3: fetch details (50 ids per videos.list call, calls sent as HTTP batches)
+        rows: List[VideoRow] = []
+        for v in _fetch_video_items(yt, video_ids, debug, sleep_every=sleep_every):
+            row = _video_to_row(v, channel_title, channel_id, content_type, min_views)
+            if row is not None:
+                rows.append(row)
+
+        debug.append(f"After filtering: {len(rows)} videos.")
+        progress(0.5, f"Fetched metadata for {len(rows)} videos")
+
+        # Sort popular-first
+        if popular_first and top_k is not None and top_k < len(rows) // 4:
+            # a small heap beats a full sort only when few rows are kept
+            rows = heapq.nlargest(top_k, rows, key=attrgetter("view_count"))
+        elif popular_first:
+            rows.sort(key=attrgetter("view_count"), reverse=True)
+            if top_k is not None:
+                del rows[top_k:]
+        else:
+            # playlist order is newest-first typically; keep as is
+            if top_k is not None:
+                del rows[top_k:]
+
+        # Rank
         for idx, r in enumerate(rows, start=1):
-            t, err = _get_transcript_text(
-                r["video_id"],
-                languages=transcript_languages,
-                cookies_txt_path=cookies_txt_path,
-            )
-            r["transcript"] = t
-            r["transcript_error"] = err
-            # mild backoff if rate-limited
-            if err == "TooManyRequests":
-                time.sleep(2.0)
-            # short sleep to be polite when doing lots
-            if idx % 25 == 0:
-                time.sleep(0.2)
-    else:
-        for r in rows:
-            r["transcript"] = None
-            r["transcript_error"] = None
-
-    return rows, debug
+            r.rank = idx
+
+        # Step 4: transcripts (optional)
+        if pool is not None:
+            if not futures:
+                debug.append(f"Fetching transcripts (where available) with {workers} workers...")
+                futures = {r.video_id: pool.submit(_fetch_one, r.video_id) for r in rows}
+            pending = {futures[r.video_id]: r for r in rows}
+            # report roughly every 1% so large scrapes don't flood the UI with updates
+            step = max(1, len(rows) // 100)
+            for done, fut in enumerate(as_completed(pending), start=1):
+                r = pending[fut]
+                r.transcript, r.transcript_error = fut.result()
+                if done % step == 0 or done == len(rows):
+                    progress(0.5 + 0.5 * done / len(rows), f"Transcripts {done}/{len(rows)}")
+        completed = True
+    finally:
+        if pool is not None and not completed:
+            # Don't hold the error back behind in-flight transcript fetches: cancel the queued
+            # ones, and close the fallback (and its cookie copy) once the running ones finish.
+            pool.shutdown(wait=False, cancel_futures=True)
+            if fallback is not None:
+                threading.Thread(target=_close_after_pool, args=(pool, fallback), daemon=True).start()
+        else:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+            if fallback is not None:
+                fallback.close()
+
+    progress(1.0, "Done")
+    return [r.as_dict() for r in rows], debug